@@ -1,14 +1,10 @@
 import os
-from typing import Optional
+import threading
+from typing import TYPE_CHECKING
 
 # Configuration
 from scaledown.config import set_api_key, get_api_key
 
-# Core Components
-from scaledown.pipeline import Pipeline, make_pipeline
-# HasteOptimizer is optional, import from scaledown.optimizer if needed
-from scaledown.compressor.scaledown_compressor import ScaleDownCompressor
-
 # Types & Exceptions
 from scaledown.types import (
     CompressedPrompt,
@@ -23,9 +19,6 @@ from scaledown.exceptions import (
     APIError
 )
 
-# Initialize global state if env var exists
-_API_KEY: Optional[str] = os.environ.get("SCALEDOWN_API_KEY")
-
 __all__ = [
     "Pipeline",
     "make_pipeline",
@@ -40,3 +33,35 @@ __all__ = [
     "AuthenticationError",
     "APIError"
 ]
+
+def _warm_tokenizer():
+    """Build the default tiktoken encoding so the first count_tokens call is cheap."""
+    try:
+        from scaledown.types.metrics import _get_encoding
+        _get_encoding("gpt-4o")
+    except Exception:
+        # tiktoken missing or its encoding files unreachable; the first real
+        # count_tokens call reports it
+        pass
+
+# Warm in the background so importing scaledown never waits on it
+if os.environ.get("SCALEDOWN_NO_WARMUP") != "1":
+    threading.Thread(target=_warm_tokenizer, name="scaledown-tokenizer-warmup", daemon=True).start()
+
+# Core Components are imported on first access (PEP 562), so `import scaledown`
+# stays cheap for callers that only configure the API key or use the types.
+# HasteOptimizer is optional, import from scaledown.optimizer if needed
+def __getattr__(name):
+    if name in ("Pipeline", "make_pipeline"):
+        from scaledown import pipeline
+        return getattr(pipeline, name)
+
+    if name == "ScaleDownCompressor":
+        from scaledown.compressor.scaledown_compressor import ScaleDownCompressor
+        return ScaleDownCompressor
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+if TYPE_CHECKING:
+    from scaledown.pipeline import Pipeline, make_pipeline
+    from scaledown.compressor.scaledown_compressor import ScaleDownCompressor
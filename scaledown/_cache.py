@@ -0,0 +1,75 @@
+"""
+Small in-process caches shared by optimizers and compressors.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+def fast_hash(data: bytes) -> bytes:
+    """
+    128-bit digest of `data` for in-memory cache keys.
+
+    Uses xxh3 when `xxhash` is installed, else BLAKE2b; both are much faster
+    than SHA-1/SHA-256 on large inputs. The digest differs between the two,
+    so never persist it.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_128_digest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with an optional time-to-live per entry.
+
+    Parameters
+    ----------
+    maxsize : int, default=256
+        Maximum number of entries; the least recently used entry is evicted first
+    ttl : float, optional
+        Seconds an entry stays valid. Entries never expire if None.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key`, or `default` if missing or expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store `value` under `key`, evicting the oldest entries if full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
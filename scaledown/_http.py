@@ -0,0 +1,26 @@
+"""
+Shared HTTP session for outbound ScaleDown API calls.
+
+A single pooled session keeps TCP/TLS connections alive between requests
+instead of paying a fresh handshake on every call.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        # Above the compressor's default batch concurrency, so batch
+        # requests never wait on (or discard) a pooled connection
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = _build_session()
@@ -1,8 +1,13 @@
+import asyncio
+import dataclasses
+import json
 import requests
 from typing import Union, List, Optional
 from concurrent.futures import ThreadPoolExecutor
 
 from .base import BaseCompressor
+from .._cache import TTLCache, fast_hash
+from .._http import SESSION
 from ..exceptions import AuthenticationError, APIError
 from ..types import CompressedPrompt
 from .config import get_api_url
@@ -10,15 +15,23 @@ from .config import get_api_url
 class ScaleDownCompressor(BaseCompressor):
     """
     Standard ScaleDown compressor using the hosted model on API.
+
+    Responses are cached per instance (LRU, `cache_size` entries, each valid
+    for `cache_ttl_s` seconds), so repeated identical requests skip the API.
+    Set `cache_size=0` to disable.
     """
     def __init__(self, target_model='gpt-4o', rate='auto', api_key=None, 
-                 temperature=None, preserve_keywords=False, preserve_words=None):
+                 temperature=None, preserve_keywords=False, preserve_words=None,
+                 max_workers=8, cache_size=256, cache_ttl_s=300.0):
         super().__init__(rate=rate, api_key=api_key)
         self.api_url = get_api_url()
         self.target_model = target_model
         self.temperature = temperature
         self.preserve_keywords = preserve_keywords
         self.preserve_words = preserve_words or []
+        # Concurrent requests for batch input; all share the pooled session
+        self.max_workers = max_workers
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl_s)
 
     def compress(self, context: Union[str, List[str]], prompt: Union[str, List[str]], 
                  max_tokens: int = None, **kwargs) -> Union[CompressedPrompt, List[CompressedPrompt]]:
@@ -40,8 +53,18 @@ class ScaleDownCompressor(BaseCompressor):
         else:
             raise ValueError("Invalid combination of context and prompt types.")
 
+    async def compress_async(self, context: Union[str, List[str]], prompt: Union[str, List[str]],
+                             max_tokens: int = None, **kwargs) -> Union[CompressedPrompt, List[CompressedPrompt]]:
+        """
+        Awaitable `compress`, for use inside an event loop.
+
+        The blocking API calls (and batch fan-out) run in a worker thread so
+        the loop stays free; results are the same as `compress`.
+        """
+        return await asyncio.to_thread(self.compress, context, prompt, max_tokens=max_tokens, **kwargs)
+
     def _compress_batch(self, context_list, prompt_list, **kwargs):
-        with ThreadPoolExecutor(max_workers=5) as executor:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             results = list(executor.map(
                 lambda p: self._compress_single(p[0], p[1], **kwargs), 
                 zip(context_list, prompt_list)
@@ -72,9 +95,17 @@ class ScaleDownCompressor(BaseCompressor):
             }
         }
 
+        full_url=f"{self.api_url}/compress/raw"
+        # Key on everything sent except the API key
+        cache_key = fast_hash(
+            json.dumps([full_url, payload], sort_keys=True, default=str).encode("utf-8")
+        )
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return dataclasses.replace(cached, latency=0)
+
         try:
-            full_url=f"{self.api_url}/compress/raw"
-            response = requests.post(
+            response = SESSION.post(
                  full_url,
                  headers=headers,
                  json=payload
@@ -97,10 +128,13 @@ class ScaleDownCompressor(BaseCompressor):
                 "timestamp": data.get("request_metadata", {}).get("timestamp")
             }
             
-            return CompressedPrompt.from_api_response(
+            result = CompressedPrompt.from_api_response(
                 content=content, 
                 raw_response=prepared_metrics 
             )
+            # Cache a private copy; callers may edit the one they get back
+            self._cache.set(cache_key, dataclasses.replace(result))
+            return result
 
         except requests.exceptions.RequestException as e:
             raise APIError(f"Connection failed: {str(e)}")
@@ -8,7 +8,8 @@ class BaseOptimizer(ABC):
     Optimizers process raw context before compression.
     """
     
-    def __init__(self, api_key: Optional[str] = None, target_model:str="gpt-4o", **kwargs):
+    def __init__(self, api_key: Optional[str] = None, target_model:str="gpt-4o",
+                 collect_metrics: bool = True, **kwargs):
         """
         Initialize optimizer.
         
@@ -16,11 +17,15 @@ class BaseOptimizer(ABC):
         ----------
         api_key : str, optional
             API key for optimizer services (if needed)
+        collect_metrics : bool, default=True
+            Count tokens for the returned metrics. If False, optimizers skip
+            that work and return a shared all-zero placeholder instead.
         **kwargs : dict
             Additional optimizer-specific parameters
         """
         self.api_key = api_key or scaledown.get_api_key()
         self.target_model = target_model
+        self.collect_metrics = collect_metrics
         self.config = kwargs
     
     @abstractmethod
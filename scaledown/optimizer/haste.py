@@ -3,6 +3,7 @@ HASTE optimizer integration for scaledown.
 Uses the local HasteContext library for code context retrieval.
 """
 from typing import Union, List, Optional, Dict, Any
+import dataclasses
 import time
 import os
 import tempfile
@@ -14,9 +15,30 @@ except ImportError:
     HASTE_AVAILABLE = False
 
 from .base import BaseOptimizer
+from .._cache import TTLCache, fast_hash
 from ..exceptions import OptimizerError
 from ..types import OptimizedContext, OptimizerMetrics
-from ..types.metrics import count_tokens
+from ..types.metrics import _NULL_METRICS, count_tokens_batch
+
+# HASTE only exposes a path-based entry point (select_from_file), so string
+# contexts still need a file. Prefer a RAM-backed tmpfs when one is available
+# so that round-trip never touches disk.
+_SHM_DIR = "/dev/shm"
+_TEMP_DIR = _SHM_DIR if os.path.isdir(_SHM_DIR) and os.access(_SHM_DIR, os.W_OK) else None
+
+# Results keyed by (source identity, query, retrieval params). File sources are
+# identified by their mtime/size, so edits invalidate stale entries.
+_RESULT_CACHE = TTLCache(maxsize=256, ttl=300)
+
+
+def _write_and_close(fd: int, text: str) -> None:
+    """Write `text` as UTF-8 straight to `fd`, skipping Python's buffered text I/O."""
+    try:
+        data = memoryview(text.encode('utf-8'))
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
 
 
 class HasteOptimizer(BaseOptimizer):
@@ -44,6 +66,9 @@ class HasteOptimizer(BaseOptimizer):
         Hard token cap for output
     soft_cap : int, default=1800
         Soft token cap for output
+    collect_metrics : bool, default=True
+        Count original/optimized tokens. If False, skips reading the source
+        back and tokenizing it, and returns placeholder metrics.
     """
     
     def __init__(
@@ -89,13 +114,13 @@ class HasteOptimizer(BaseOptimizer):
         Parameters
         ----------
         context : str or List[str]
-            Source code content (currently expects file path in file_path param)
+            Source code to analyze when file_path is not given
         query : str
             Query to guide context retrieval (e.g., "find training loop")
         max_tokens : int, optional
             Maximum token budget (uses hard_cap if not specified)
         file_path : str, optional
-            Path to Python file to analyze (required for HASTE)
+            Path to Python file to analyze; takes precedence over context
         **kwargs : dict
             Additional HASTE parameters
             
@@ -115,20 +140,27 @@ class HasteOptimizer(BaseOptimizer):
         if not query:
             raise ValueError("Query is required for HASTE optimization")
 
+        cache_key = self._cache_key(context, file_path, query, max_tokens)
+        cached = _RESULT_CACHE.get(cache_key) if cache_key else None
+        if cached is not None:
+            if cached.metrics is _NULL_METRICS:
+                return OptimizedContext(content=cached.content, metrics=_NULL_METRICS)
+            return OptimizedContext(
+                content=cached.content,
+                metrics=dataclasses.replace(
+                    cached.metrics,
+                    latency_ms=int((time.time() - start_time) * 1000)
+                )
+            )
+
         # 3. Handle string input without file_path by creating a temp file
         temp_path = None
         if not file_path:
             # If context is a string, we can try to write it to a temp file
             if isinstance(context, str) and len(context.strip()) > 0:
-                # Write to temp file
-                with tempfile.NamedTemporaryFile(
-                    mode='w',
-                    suffix='.py',
-                    delete=False,
-                    encoding='utf-8'
-                ) as f:
-                    f.write(context)
-                    temp_path = f.name
+                original_code = context
+                # Create the temp file; it is written inside the try below
+                temp_fd, temp_path = tempfile.mkstemp(suffix='.py', dir=_TEMP_DIR)
                 file_path = temp_path
             else:
                  raise ValueError(
@@ -137,6 +169,16 @@ class HasteOptimizer(BaseOptimizer):
 
 
         try:
+            # Read the source once; a temp file gets `context` verbatim.
+            # The read is only for token counts.
+            if temp_path is not None:
+                _write_and_close(temp_fd, context)
+            elif self.collect_metrics:
+                original_code = ""
+                if os.path.exists(file_path):
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        original_code = f.read()
+
             # Call HASTE's select_from_file function
             result = select_from_file(
                 path=file_path,
@@ -157,35 +199,72 @@ class HasteOptimizer(BaseOptimizer):
             optimized_content = result.get('code', '')
             nodes = result.get('nodes', [])
             
-            # Estimate original tokens
-            original_tokens = 0
-            if file_path and os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    original_code = f.read()
-                original_tokens = count_tokens(original_code, model=self.target_model)
-            
-            optimized_tokens = count_tokens(optimized_content, model=self.target_model)
-            
-            metrics = OptimizerMetrics(
-                original_tokens=original_tokens,
-                optimized_tokens=optimized_tokens,
-                chunks_retrieved=len(nodes),
-                compression_ratio=original_tokens / max(optimized_tokens, 1),
-                latency_ms=latency_ms,
-                retrieval_mode='hybrid' if self.semantic else 'bm25',
-                ast_fidelity=1.0 
-            )
+            if self.collect_metrics:
+                original_tokens, optimized_tokens = count_tokens_batch(
+                    [original_code, optimized_content], model=self.target_model
+                )
+
+                metrics = OptimizerMetrics(
+                    original_tokens=original_tokens,
+                    optimized_tokens=optimized_tokens,
+                    chunks_retrieved=len(nodes),
+                    compression_ratio=original_tokens / max(optimized_tokens, 1),
+                    latency_ms=latency_ms,
+                    retrieval_mode='hybrid' if self.semantic else 'bm25',
+                    ast_fidelity=1.0 
+                )
+            else:
+                metrics = _NULL_METRICS
             
-            return OptimizedContext(
+            optimized = OptimizedContext(
                 content=optimized_content,
                 metrics=metrics
             )
+            if cache_key:
+                # Cache a separate object; callers may edit the one they get back
+                _RESULT_CACHE.set(cache_key, OptimizedContext(content=optimized_content, metrics=metrics))
+            return optimized
             
         except Exception as e:
             raise OptimizerError(f"HASTE optimization failed: {str(e)}")
         finally:
             if temp_path and os.path.exists(temp_path):
                 os.unlink(temp_path)
+
+    def _cache_key(
+        self,
+        context: Union[str, List[str]],
+        file_path: Optional[str],
+        query: str,
+        max_tokens: Optional[int]
+    ) -> Optional[tuple]:
+        """Build the result-cache key, or None if the source can't be identified."""
+        if file_path:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return None
+            source = ("file", os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+        elif isinstance(context, str) and context.strip():
+            source = ("text", fast_hash(context.encode("utf-8")))
+        else:
+            return None
+
+        return (
+            source,
+            query,
+            self.top_k,
+            self.prefilter,
+            self.bfs_depth,
+            self.max_add,
+            self.semantic,
+            self.sem_model,
+            max_tokens or self.hard_cap,
+            self.soft_cap,
+            self.target_model,
+            self.collect_metrics,
+        )
+
 # Alias for backward compatibility
 HasteContext = HasteOptimizer
     
\ No newline at end of file
@@ -1,27 +1,92 @@
 import os
 import ast
+import hashlib
+import io
 import logging
+import tempfile
+import threading
 import time
-from typing import List, Dict, Any, Optional, Union
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 
+from scaledown._cache import TTLCache, fast_hash
 from scaledown.optimizer.base import BaseOptimizer
 from scaledown.types import OptimizedContext
-from scaledown.types.metrics import OptimizerMetrics, count_tokens
+from scaledown.types.metrics import _NULL_METRICS, OptimizerMetrics, count_tokens
 from scaledown.exceptions import OptimizerError
 
 logger = logging.getLogger(__name__)
 
+# Loaded SentenceTransformer models keyed by model name
+_MODEL_CACHE: Dict[str, Any] = {}
+_MODEL_LOCK = threading.Lock()
+
+# AST fields that hold nested statement blocks (incl. except/match-case bodies)
+_BLOCK_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+
+def _source_segment(lines: List[str], node: ast.AST) -> str:
+    """Same result as ast.get_source_segment, using pre-split source lines."""
+    first, last = node.lineno - 1, node.end_lineno - 1
+    # Column offsets are UTF-8 byte offsets
+    if first == last:
+        return lines[first].encode("utf-8")[node.col_offset:node.end_col_offset].decode("utf-8")
+    head = lines[first].encode("utf-8")[node.col_offset:].decode("utf-8")
+    tail = lines[last].encode("utf-8")[:node.end_col_offset].decode("utf-8")
+    return "".join([head, *lines[first + 1:last], tail])
+
+# Parsed units keyed by a hash of the source, so identical code is parsed once
+# however many files (or temp copies) it appears in
+_UNIT_CACHE = TTLCache(maxsize=64)
+
+def _parse_semantic_units(source: str, file_path: str) -> Tuple[Tuple[str, str, str], ...]:
+    """
+    Parses source into its functions and classes, using AST.
+
+    Returns (type, name, code) tuples; `file_path` is only used in errors.
+    """
+    try:
+        tree = ast.parse(source)
+        # Split once; newline="" splits like the parser (\n, \r\n, \r only)
+        lines = io.StringIO(source, newline="").readlines()
+        units = []
+
+        # Visit statements only (defs can't hide inside expressions),
+        # descending into every nested block
+        stack = list(reversed(tree.body))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, ast.ClassDef):
+                units.append(("class", node.name, _source_segment(lines, node)))
+            elif isinstance(node, ast.FunctionDef):
+                units.append(("function", node.name, _source_segment(lines, node)))
+
+            children = []
+            for field in _BLOCK_FIELDS:
+                children.extend(getattr(node, field, ()))
+            stack.extend(reversed(children))
+        return tuple(units)
+    except Exception as e:
+        raise OptimizerError(f"Failed to parse AST for {file_path}: {e}")
+
 class SemanticOptimizer(BaseOptimizer):
     """
     An optimizer that uses local embeddings and FAISS to find semantically 
     relevant code chunks (functions/classes) for a given query.
+
+    Chunk embeddings are cached in memory by content hash, and optionally on
+    disk under `cache_dir` so they survive across processes.
     """
 
-    def __init__(self, model_name: str = "Qwen/Qwen3-Embedding-0.6B", top_k: int = 3, target_model: str = "gpt-4o", **kwargs):
+    def __init__(self, model_name: str = "Qwen/Qwen3-Embedding-0.6B", top_k: int = 3, target_model: str = "gpt-4o",
+                 cache_dir: Optional[str] = None, **kwargs):
         super().__init__(target_model=target_model, **kwargs)
         self.model_name = model_name
         self.top_k = top_k
+        self.cache_dir = cache_dir
+        self._embedding_cache = TTLCache(maxsize=4096)
+        # Per instance, so the key is effectively (model_name, query)
+        self._embed_query = lru_cache(maxsize=512)(self._encode_query)
         self._model = None
         self._faiss = None
         self._numpy = None
@@ -42,54 +107,47 @@ class SemanticOptimizer(BaseOptimizer):
                 "Install them with: pip install scaledown[semantic]"
             ) from e
 
-        logger.info(f"Loading embedding model: {self.model_name}...")
-        try:
-            self._model = SentenceTransformer(self.model_name)
-            self._faiss = faiss
-            self._numpy = np
-        except Exception as e:
-            # Catch any error during model loading (Network, File missing, etc.)
-            logger.error(f"Failed to load semantic model: {e}")
-            logger.warning("Falling back to pass-through mode.")
-            self.model_load_failed = True
-
-    def _extract_semantic_units(self, file_path: str) -> List[Dict[str, Any]]:
-        """Extracts functions and classes using AST."""
+        # One model per name, shared by every instance in the process;
+        # the lock also stops concurrent callers loading it twice
+        with _MODEL_LOCK:
+            model = _MODEL_CACHE.get(self.model_name)
+            if model is None:
+                logger.info(f"Loading embedding model: {self.model_name}...")
+                try:
+                    model = SentenceTransformer(self.model_name)
+                except Exception as e:
+                    # Catch any error during model loading (Network, File missing, etc.)
+                    logger.error(f"Failed to load semantic model: {e}")
+                    logger.warning("Falling back to pass-through mode.")
+                    self.model_load_failed = True
+                    return
+                _MODEL_CACHE[self.model_name] = model
+
+        self._model = model
+        self._faiss = faiss
+        self._numpy = np
+
+    def _extract_semantic_units(self, file_path: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """Extracts functions and classes using AST, parsing each distinct source only once."""
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 source = f.read()
-            
-            tree = ast.parse(source)
-            units = []
-
-            # Add the full file context
-            units.append({
-                "type": "file",
-                "name": os.path.basename(file_path),
-                "code": source,
-                "metadata": {"file_name": os.path.basename(file_path)}
-            })
-
-            # Walk AST for Classes and Functions
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    units.append({
-                        "type": "class",
-                        "name": node.name,
-                        "code": ast.get_source_segment(source, node),
-                        "metadata": {"file_name": os.path.basename(file_path)}
-                    })
-                elif isinstance(node, ast.FunctionDef):
-                    units.append({
-                        "type": "function",
-                        "name": node.name,
-                        "code": ast.get_source_segment(source, node),
-                        "metadata": {"file_name": os.path.basename(file_path)}
-                    })
-            return units
-        except Exception as e:
+        except (OSError, UnicodeDecodeError) as e:
             raise OptimizerError(f"Failed to parse AST for {file_path}: {e}")
 
+        key = fast_hash(source.encode("utf-8"))
+        parsed = _UNIT_CACHE.get(key)
+        if parsed is None:
+            parsed = _parse_semantic_units(source, file_path)
+            _UNIT_CACHE.set(key, parsed)
+
+        file_name = os.path.basename(file_path)
+        units = [
+            {"type": kind, "name": name, "code": code, "metadata": {"file_name": file_name}}
+            for kind, name, code in parsed
+        ]
+        return source, units
+
     def optimize(
         self,
         context: Union[str, List[str]],
@@ -105,56 +163,43 @@ class SemanticOptimizer(BaseOptimizer):
 
         if not file_path:
             logger.warning("SemanticOptimizer requires 'file_path'. Returning original.")
-            orig_tokens = count_tokens(str(context), model=self.target_model)
+            orig_tokens = count_tokens(str(context), model=self.target_model) if self.collect_metrics else 0
             return self._create_fallback_context(str(context), orig_tokens, start_time, "missing_filepath")
 
         self._lazy_load_deps()
         
         # Extract Chunks
-        units = self._extract_semantic_units(file_path)
-        full_source = units[0]["code"] if units and units[0]["type"] == "file" else ""
-        orig_tokens = count_tokens(full_source, model=self.target_model)
+        full_source, units = self._extract_semantic_units(file_path)
+        orig_tokens = count_tokens(full_source, model=self.target_model) if self.collect_metrics else 0
 
         # whether model fails to load
         if self.model_load_failed:
             return self._create_fallback_context(full_source, orig_tokens, start_time, "model_load_failed")
-        
-        if not units:
-             return self._create_fallback_context("", orig_tokens, start_time, "no_units")
 
         # Embed Chunks
-        valid_units = [u for u in units if u.get("code") and u.get("type") != "file"]
+        valid_units = [u for u in units if u.get("code")]
         
         if not valid_units:
              return self._create_fallback_context("", orig_tokens, start_time, "no_valid_chunks")
 
         codes = [u["code"] for u in valid_units]
-        embeddings = self._model.encode(codes)
-
-        # Build Index
-        d = embeddings.shape[1]
-        index = self._faiss.IndexFlatL2(d)
-        index.add(self._numpy.array(embeddings, dtype=self._numpy.float32))
+        embeddings = self._embed_chunks(codes)
 
         # Embed Query & Search
         if not query:
              query = "main logic"
 
-        query_emb = self._model.encode([query])
+        query_emb = self._embed_query(query)
         k_search = min(self.top_k, len(valid_units))
-        
-        distances, indices = index.search(
-            self._numpy.array(query_emb, dtype=self._numpy.float32), 
-            k=k_search
-        )
+        indices = self._search(embeddings, query_emb, k_search)
 
         # Construct Result
-        results = []
-        for idx in indices[0]:
-            if idx != -1:
-                results.append(valid_units[idx]["code"])
+        results = [valid_units[idx]["code"] for idx in indices]
 
         final_content = "\n\n# ... [Semantic Context Search Result] ...\n\n".join(results)
+
+        if not self.collect_metrics:
+            return OptimizedContext(content=final_content, metrics=_NULL_METRICS)
         
         # Metrics Calculation
         opt_tokens = count_tokens(final_content, model=self.target_model)
@@ -174,8 +219,108 @@ class SemanticOptimizer(BaseOptimizer):
             )
         )
 
+    def _encode(self, texts: List[str]):
+        """Embed texts in large batches as normalized float32 vectors."""
+        return self._model.encode(
+            texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+
+    def _encode_query(self, query: str):
+        emb = self._encode([query])
+        # Shared by every cache hit, so guard against in-place edits
+        emb.flags.writeable = False
+        return emb
+
+    def _quantize(self, embeddings):
+        """Maps normalized float embeddings (components in [-1, 1]) to int8."""
+        np = self._numpy
+        return np.clip(np.rint(embeddings * 127), -127, 127).astype(np.int8)
+
+    def _embed_chunks(self, codes: List[str]):
+        """
+        Embeds code chunks, encoding only those missing from the cache.
+
+        Identical chunks are embedded once and share a row. Vectors are kept
+        (and cached) as int8, a quarter of the float32 size.
+        """
+        # Map each distinct chunk to its row in the unique matrix
+        rows: Dict[str, int] = {}
+        for code in codes:
+            rows.setdefault(code, len(rows))
+        unique_codes = list(rows)
+
+        # Stable across installs (unlike fast_hash), since keys name files in cache_dir
+        keys = [hashlib.sha1(code.encode("utf-8")).hexdigest() for code in unique_codes]
+        vectors = [self._load_embedding(key) for key in keys]
+
+        misses = [i for i, vec in enumerate(vectors) if vec is None]
+        if misses:
+            fresh = self._quantize(self._encode([unique_codes[i] for i in misses]))
+            for i, vec in zip(misses, fresh):
+                vectors[i] = vec
+                self._store_embedding(keys[i], vec)
+
+        unique_embeddings = self._numpy.stack(vectors)
+        if len(unique_codes) == len(codes):
+            return unique_embeddings
+        return unique_embeddings[[rows[code] for code in codes]]
+
+    def _embedding_path(self, key: str) -> str:
+        model_slug = self.model_name.replace("/", "--")
+        return os.path.join(self.cache_dir, f"{key}.{model_slug}.i8.npy")
+
+    def _load_embedding(self, key: str):
+        vec = self._embedding_cache.get(key)
+        if vec is not None or not self.cache_dir:
+            return vec
+
+        path = self._embedding_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            vec = self._numpy.load(path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable embedding cache entry {path}: {e}")
+            return None
+        self._embedding_cache.set(key, vec)
+        return vec
+
+    def _store_embedding(self, key: str, vec) -> None:
+        self._embedding_cache.set(key, vec)
+        if not self.cache_dir:
+            return
+
+        path = self._embedding_path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".tmp", delete=False) as f:
+                self._numpy.save(f, vec)
+            os.replace(f.name, path)
+        except OSError as e:
+            logger.debug(f"Could not write embedding cache entry {path}: {e}")
+
+    def _search(self, embeddings, query_emb, k: int) -> List[int]:
+        """Returns indices of the `k` chunks closest to the query, best first."""
+        np = self._numpy
+        # Dequantize for BLAS; the uniform int8 scale doesn't change the ranking
+        vectors = embeddings.astype(np.float32)
+        # Exact scan at any size: an index built per query costs far more than
+        # one matrix-vector product. Embeddings are normalized, so the dot
+        # product ranks by cosine similarity
+        scores = vectors @ query_emb[0]
+        top = np.argpartition(-scores, k - 1)[:k]
+        # Best score first; ties keep source order
+        return top[np.lexsort((top, -scores[top]))].tolist()
+
     def _create_fallback_context(self, content, tokens, start_time, reason):
         """Helper to create consistent fallback response."""
+        if not self.collect_metrics:
+            return OptimizedContext(content=content, metrics=_NULL_METRICS)
         return OptimizedContext(
             content=content,
             metrics=OptimizerMetrics(
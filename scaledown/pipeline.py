@@ -1,10 +1,19 @@
-from typing import List, Tuple, Union, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, List, Tuple, Union, Optional
 from scaledown.optimizer.base import BaseOptimizer
 from scaledown.compressor.base import BaseCompressor
 from scaledown.types import OptimizedContext, CompressedPrompt
 from scaledown.types import PipelineResult, StepMetadata
 from scaledown.types.metrics import count_tokens
 
+@dataclass
+class _PipelineCarry:
+    """Context passed between steps, with its token count when already known."""
+    text: str
+    # count_tokens(text) if already computed, else None
+    tokens: Optional[int] = None
+
 class Pipeline:
     """
     Pipeline for chaining optimizers and compressors.
@@ -23,7 +32,7 @@ class Pipeline:
     >>> result = pipe.run(context=code, query="Add type hints", prompt="Explain changes")
     """
     
-    def __init__(self, steps: List[Tuple[str, Union[BaseOptimizer, BaseCompressor]]]):
+    def __init__(self, steps: List[Tuple[str, Union[BaseOptimizer, BaseCompressor]]], max_workers: int = 5):
         """
         Initialize pipeline with ordered steps.
         
@@ -31,9 +40,13 @@ class Pipeline:
         ----------
         steps : List[Tuple[str, Union[BaseOptimizer, BaseCompressor]]]
             List of (name, transformer) tuples
+        max_workers : int, default=5
+            Number of threads used when `run` is given a list of contexts
         """
         self.steps = steps
+        self.max_workers = max_workers
         self._validate_steps()
+        self._plan = self._build_plan()
     
     def _validate_steps(self):
         """Validate pipeline structure."""
@@ -50,46 +63,29 @@ class Pipeline:
                     f"Optimizer '{name}' cannot come after a compressor. "
                     "Pipeline order must be: optimizers -> compressors"
                 )
-    def run(self, context: str, **kwargs) -> PipelineResult:
-        current_context = context
+
+    def run(self, context: Union[str, List[str]], **kwargs) -> Union[PipelineResult, List[PipelineResult]]:
+        """
+        Run every step over the context.
+
+        A list of contexts is processed item by item in parallel threads and
+        returns one PipelineResult per item, in input order.
+        """
+        if isinstance(context, list):
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(executor.map(
+                    lambda item: self._run_single(item, **kwargs),
+                    context
+                ))
+        return self._run_single(context, **kwargs)
+
+    def _run_single(self, context: str, **kwargs) -> PipelineResult:
+        carry = _PipelineCarry(text=context)
         original_context = context
         history: List[StepMetadata] = []
 
-        for name, component in self.steps:
-            step_type = "custom"
-            inp, out, lat = 0, 0, 0.0
-            
-            # OPTIMIZER
-            if isinstance(component, BaseOptimizer):
-                step_type = "optimization"
-                result = component.optimize(
-                    context=current_context,
-                    **kwargs
-                )
-                inp = getattr(result.metrics, 'original_tokens', 0)
-                out = getattr(result.metrics, 'optimized_tokens', 0)
-                lat = getattr(result.metrics, 'latency_ms', 0.0)
-                current_context = result.content
-            
-            # COMPRESSOR
-            elif isinstance(component, BaseCompressor):
-                step_type = "compression"
-                result = component.compress(
-                    context=current_context,
-                    **kwargs
-                )
-                inp = result.tokens[0]
-                out = result.tokens[1]
-                lat = result.latency
-                current_context = result.content
-            
-            # UNKNOWN
-            else:
-                output = component(current_context, **kwargs)
-                inp = count_tokens(current_context)
-                out = count_tokens(output)
-                current_context = output
-            
+        for name, step_type, component, runner in self._plan:
+            carry, inp, out, lat = runner(component, carry, **kwargs)
             history.append(StepMetadata(
                 step_name=name,
                 input_tokens=inp,
@@ -99,10 +95,50 @@ class Pipeline:
             ))
 
         return PipelineResult(
-            final_content=current_context,
+            final_content=carry.text,
             original_content=original_context,
             history=history
         )
+
+    def _build_plan(self) -> List[Tuple[str, str, Any, Callable]]:
+        """Resolve each step's kind and runner once, so `run` never type-checks."""
+        plan = []
+        for name, component in self.steps:
+            if isinstance(component, BaseOptimizer):
+                plan.append((name, "optimization", component, self._run_optimizer))
+            elif isinstance(component, BaseCompressor):
+                plan.append((name, "compression", component, self._run_compressor))
+            else:
+                plan.append((name, "custom", component, self._run_custom))
+        return plan
+
+    # Each runner returns (carry, input_tokens, output_tokens, latency_ms).
+    # Optimizer/compressor counts come from their own tokenizer (or the API),
+    # so only custom steps fill in carry.tokens.
+
+    @staticmethod
+    def _run_optimizer(component, carry, **kwargs):
+        result = component.optimize(context=carry.text, **kwargs)
+        return (
+            _PipelineCarry(text=result.content),
+            getattr(result.metrics, 'original_tokens', 0),
+            getattr(result.metrics, 'optimized_tokens', 0),
+            getattr(result.metrics, 'latency_ms', 0.0),
+        )
+
+    @staticmethod
+    def _run_compressor(component, carry, **kwargs):
+        result = component.compress(context=carry.text, **kwargs)
+        return _PipelineCarry(text=result.content), result.tokens[0], result.tokens[1], result.latency
+
+    @staticmethod
+    def _run_custom(component, carry, **kwargs):
+        output = component(carry.text, **kwargs)
+        # Exact counts, like the other steps, since PipelineResult compares the
+        # first and last step; reuse the previous step's count when known
+        inp = carry.tokens if carry.tokens is not None else count_tokens(carry.text)
+        out = count_tokens(output)
+        return _PipelineCarry(text=output, tokens=out), inp, out, 0.0
     
     def get_step(self, name: str) -> Union[BaseOptimizer, BaseCompressor]:
         """Get a step by name."""
@@ -1,38 +1,77 @@
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, NamedTuple
 import logging
 logger = logging.getLogger(__name__)
-try:
-    import tiktoken
 
-except ImportError:
-    tiktoken = None
-
-def count_tokens(text: str, model: str = "gpt-4o") -> int:
+@lru_cache(maxsize=32)
+def _get_encoding(model: str):
     """
-    Count tokens using tiktoken. 
-    
+    Resolve (and memoize) the tiktoken encoding for a model.
+
     If the provided model is not compatible with tiktoken (e.g., Claude, Llama),
     it falls back to 'cl100k_base' (GPT-4) encoding to ensure a standard metric.
+    tiktoken is imported here, on first use, rather than with the package.
     """
-    if not text:
-        return 0
-        
-    if tiktoken is None:
+    try:
+        import tiktoken
+    except ImportError as e:
         raise ImportError(
             "tiktoken is required for accurate metrics. "
             "Install it with: pip install tiktoken"
-        )
-            
+        ) from e
+
     try:
-        encoding = tiktoken.encoding_for_model(model)
+        return tiktoken.encoding_for_model(model)
     except KeyError:
         # Fallback for non-OpenAI models to a standard encoding
         logger.debug(f"Model '{model}' not found in tiktoken. Defaulting to cl100k_base.")
-        encoding = tiktoken.get_encoding("cl100k_base")
-        
-    return len(encoding.encode(text))
+        return tiktoken.get_encoding("cl100k_base")
+
+def count_tokens_approx(text: str) -> int:
+    """
+    Estimate tokens as one per ~4 characters, without running a tokenizer.
+
+    Only suitable for display metrics (ratios, logging), never for anything
+    billed or enforced against a model's context limit.
+    """
+    return (len(text) + 3) >> 2
+
+def count_tokens(text: str, model: str = "gpt-4o", exact: bool = True) -> int:
+    """
+    Count tokens using tiktoken. 
+    
+    The encoding for each model is resolved once and reused across calls.
+    Pass `exact=False` to get the cheap `count_tokens_approx` estimate instead.
+    """
+    if not text:
+        return 0
+
+    if not exact:
+        return count_tokens_approx(text)
+
+    # Byte-level BPE vocabularies hold every single byte as a token, so a lone
+    # ASCII character is always exactly one token
+    if len(text) == 1 and text.isascii():
+        return 1
 
-@dataclass
+    return len(_get_encoding(model).encode(text))
+
+def count_tokens_batch(texts: List[str], model: str = "gpt-4o") -> List[int]:
+    """
+    Count tokens for several texts in one call.
+
+    Uses tiktoken's encode_batch, which tokenizes the texts in parallel
+    threads instead of crossing into the tokenizer once per text.
+    """
+    if not texts:
+        return []
+
+    encoded = _get_encoding(model).encode_batch(texts, num_threads=min(8, len(texts)))
+    return [len(ids) for ids in encoded]
+
+# Slotted and frozen: pipelines keep one of these per step in their history
+@dataclass(slots=True, frozen=True)
 class OptimizerMetrics:
     original_tokens: int
     optimized_tokens: int
@@ -42,8 +81,20 @@ class OptimizerMetrics:
     retrieval_mode: str
     ast_fidelity: float
 
-@dataclass
-class CompressorMetrics:
+# Shared placeholder returned by optimizers built with collect_metrics=False;
+# safe to share because metrics are frozen
+_NULL_METRICS = OptimizerMetrics(
+    original_tokens=0,
+    optimized_tokens=0,
+    chunks_retrieved=0,
+    compression_ratio=1.0,
+    latency_ms=0.0,
+    retrieval_mode="not_collected",
+    ast_fidelity=0.0
+)
+
+# Immutable like OptimizerMetrics; a NamedTuple also unpacks positionally
+class CompressorMetrics(NamedTuple):
     original_tokens: int
     compressed_tokens: int
     compression_ratio: float
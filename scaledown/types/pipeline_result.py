@@ -30,6 +30,10 @@ class PipelineResult:
     def final_tokens(self) -> int:
         return self.history[-1].output_tokens if self.history else 0
 
+    @property
+    def total_latency_ms(self) -> float:
+        return sum(step.latency_ms for step in self.history)
+
     @property
     def total_compression_ratio(self) -> float:
         if self.final_tokens == 0: return 0.0
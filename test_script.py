@@ -1,3 +1,4 @@
+import dataclasses
 import os
 import tempfile
 import time
@@ -72,7 +73,7 @@ try:
         res = opt.optimize(context=TEST_CODE, query="DataProcessor", file_path=file_path_arg)
         print("Passed")
         
-        metrics_dict = res.metrics.__dict__ if hasattr(res.metrics, '__dict__') else {}
+        metrics_dict = dataclasses.asdict(res.metrics)
         print_step_details("Semantic output", res.content, metrics_dict)
     except ImportError:
         print("Skipped (missing dependencies)")
@@ -83,10 +84,10 @@ try:
     print("\nTesting HasteOptimizer...", end=" ")
     try:
         opt = HasteOptimizer(top_k=2)
-        res = opt.optimize(context=TEST_CODE, query="calculate_average", file_path=file_path_arg, target_model="gpt-4o")
+        res = opt.optimize(context=TEST_CODE, query="calculate_average", target_model="gpt-4o")
         print("Passed")
         
-        metrics_dict = res.metrics.__dict__ if hasattr(res.metrics, '__dict__') else {}
+        metrics_dict = dataclasses.asdict(res.metrics)
         print_step_details("Haste output", res.content, metrics_dict)
     except ImportError:
          print("Skipped (missing dependencies)")
@@ -146,6 +147,7 @@ try:
     print(f"Original size: {len(TEST_CODE)} chars")
     print(f"Final size:    {len(result.final_content)} chars")
     print(f"Savings:       {result.savings_percent:.1f}%")
+    print(f"Latency:       {result.total_latency_ms:.0f}ms")
 
 except Exception as e:
     print(f"\nError: {e}")
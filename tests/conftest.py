@@ -0,0 +1,4 @@
+import os
+
+# Tests patch tiktoken lookups; keep the import-time warmup thread out of them
+os.environ.setdefault("SCALEDOWN_NO_WARMUP", "1")
@@ -0,0 +1,37 @@
+from unittest.mock import patch
+
+from scaledown import _cache
+from scaledown._cache import TTLCache, fast_hash
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Touch "a" so "b" becomes least recently used
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+def test_ttl_expiry():
+    cache = TTLCache(maxsize=4, ttl=10)
+    with patch("scaledown._cache.time.monotonic", return_value=100.0):
+        cache.set("key", "value")
+    with patch("scaledown._cache.time.monotonic", return_value=105.0):
+        assert cache.get("key") == "value"
+    with patch("scaledown._cache.time.monotonic", return_value=111.0):
+        assert cache.get("key", "missing") == "missing"
+    assert len(cache) == 0
+
+
+def test_fast_hash_is_128_bit_and_deterministic():
+    assert len(fast_hash(b"context")) == 16
+    assert fast_hash(b"context") == fast_hash(b"context")
+    assert fast_hash(b"context") != fast_hash(b"contexts")
+
+    with patch.object(_cache, "xxhash", None):
+        assert len(fast_hash(b"context")) == 16
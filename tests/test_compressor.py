@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 import os
 from unittest.mock import patch, MagicMock
@@ -17,7 +18,7 @@ def test_missing_api_key(monkeypatch):
     with pytest.raises(sd.AuthenticationError):
         comp.compress("context", "prompt")
 
-@patch('requests.post')
+@patch('requests.Session.post')
 def test_successful_compression(mock_post, compressor):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -39,7 +40,7 @@ def test_successful_compression(mock_post, compressor):
     assert result.tokens == (100, 50)
     assert result.savings_percent == 50.0
 
-@patch('requests.post')
+@patch('requests.Session.post')
 def test_batch_compression(mock_post, compressor):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -60,6 +61,70 @@ def test_batch_compression(mock_post, compressor):
     assert len(results) == 2
     assert isinstance(results[0], sd.CompressedPrompt)
 
+@patch('requests.Session.post')
+def test_repeated_request_is_served_from_cache(mock_post, compressor):
+    mock_response = MagicMock()
+    mock_response.json.return_value = {
+        "results": {"compressed_prompt": "short", "original_prompt_tokens": 8, "compressed_prompt_tokens": 2},
+        "latency_ms": 90
+    }
+    mock_post.return_value = mock_response
+
+    first = compressor.compress(context="same context", prompt="same prompt")
+    second = compressor.compress(context="same context", prompt="same prompt")
+    compressor.compress(context="same context", prompt="other prompt")
+
+    assert mock_post.call_count == 2
+    assert second.content == first.content
+    assert second.tokens == first.tokens
+    assert second.latency == 0
+
+@patch('requests.Session.post')
+def test_cached_response_is_unaffected_by_caller_edits(mock_post, compressor):
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"results": {"compressed_prompt": "short"}}
+    mock_post.return_value = mock_response
+
+    first = compressor.compress(context="ctx", prompt="p")
+    first.content += " [edited by caller]"
+    second = compressor.compress(context="ctx", prompt="p")
+    second.content += " [edited again]"
+
+    assert compressor.compress(context="ctx", prompt="p").content == "short"
+    assert mock_post.call_count == 1
+
+@patch('requests.Session.post')
+def test_batch_compression_preserves_order(mock_post):
+    def respond(url, headers=None, json=None):
+        response = MagicMock()
+        response.json.return_value = {
+            "results": {"compressed_prompt": json["context"].upper()}
+        }
+        return response
+    mock_post.side_effect = respond
+
+    comp = sd.ScaleDownCompressor(api_key="test_key", max_workers=3)
+    contexts = [f"ctx{i}" for i in range(10)]
+
+    results = comp.compress(context=contexts, prompt="p")
+
+    assert [r.content for r in results] == [c.upper() for c in contexts]
+    assert mock_post.call_count == len(contexts)
+
+@patch('requests.Session.post')
+def test_compress_async_matches_sync_batch(mock_post, compressor):
+    def respond(url, headers=None, json=None):
+        response = MagicMock()
+        response.json.return_value = {
+            "results": {"compressed_prompt": json["context"][::-1]}
+        }
+        return response
+    mock_post.side_effect = respond
+
+    results = asyncio.run(compressor.compress_async(context=["abc", "xyz"], prompt="p"))
+
+    assert [r.content for r in results] == ["cba", "zyx"]
+
 @pytest.mark.skipif(
     not os.environ.get("SCALEDOWN_API_KEY"),
     reason="Skipping live API test because SCALEDOWN_API_KEY is not set"
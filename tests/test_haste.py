@@ -1,6 +1,7 @@
 import os
 import tempfile
 import pytest
+from unittest.mock import patch
 import scaledown as sd
 from scaledown.types import OptimizedContext
 
@@ -20,7 +21,8 @@ class UnusedClass:
     pass
 """
 
-@pytest.fixture
+# Written once per session; tests must not modify it
+@pytest.fixture(scope="session")
 def temp_python_file():
     with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
         f.write(TEST_CODE)
@@ -47,3 +49,43 @@ def test_optimization_with_file(temp_python_file):
     assert "def target_function" in result.content
     # Metrics should be populated
     assert result.metrics.original_tokens > 0
+
+def test_optimization_with_code_string():
+    opt = HasteOptimizer(top_k=2, semantic=False)
+    result = opt.optimize(context=TEST_CODE, query="target_function")
+
+    assert "def target_function" in result.content
+    assert result.metrics.original_tokens > 0
+
+def test_repeated_query_uses_cache(temp_python_file):
+    from scaledown.optimizer import haste
+
+    haste._RESULT_CACHE.clear()
+    opt = HasteOptimizer(top_k=2, semantic=False)
+    with patch.object(haste, "select_from_file", wraps=haste.select_from_file) as spy:
+        first = opt.optimize(context="", query="target_function", file_path=temp_python_file)
+        original_content = first.content
+        first.content += "\n# edited by caller"
+        second = opt.optimize(context="", query="target_function", file_path=temp_python_file)
+
+    assert spy.call_count == 1
+    assert second.content == original_content
+    assert second.metrics.original_tokens == first.metrics.original_tokens
+
+def test_metrics_can_be_skipped(temp_python_file):
+    from scaledown.optimizer import haste
+
+    haste._RESULT_CACHE.clear()
+    opt = HasteOptimizer(top_k=2, semantic=False, collect_metrics=False)
+    with patch.object(haste, "count_tokens_batch") as count_tokens_batch:
+        result = opt.optimize(context="", query="target_function", file_path=temp_python_file)
+        original_content = result.content
+        result.content += "\n# edited by caller"
+        hit = opt.optimize(context="", query="target_function", file_path=temp_python_file)
+
+    assert "def target_function" in original_content
+    assert result.metrics is haste._NULL_METRICS
+    assert hit.metrics is haste._NULL_METRICS
+    assert hit.content == original_content
+    assert hit is not opt.optimize(context="", query="target_function", file_path=temp_python_file)
+    count_tokens_batch.assert_not_called()
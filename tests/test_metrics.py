@@ -0,0 +1,102 @@
+import dataclasses
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+pytest.importorskip("tiktoken")
+
+from scaledown.types.metrics import CompressorMetrics, OptimizerMetrics, count_tokens, count_tokens_approx, count_tokens_batch, _get_encoding
+
+
+@pytest.fixture(autouse=True)
+def clear_encoding_cache():
+    _get_encoding.cache_clear()
+    yield
+    _get_encoding.cache_clear()
+
+@pytest.fixture
+def fake_encoding():
+    enc = MagicMock()
+    enc.encode.side_effect = lambda text: text.split()
+    return enc
+
+def test_encoding_is_resolved_once_per_model(fake_encoding):
+    with patch("tiktoken.encoding_for_model", return_value=fake_encoding) as lookup:
+        assert count_tokens("a b c") == 3
+        assert count_tokens("d e", model="gpt-4o") == 2
+        count_tokens("f g", model="gpt-3.5-turbo")
+
+    assert lookup.call_count == 2
+
+def test_unknown_model_falls_back_to_cl100k(fake_encoding):
+    with patch("tiktoken.encoding_for_model", side_effect=KeyError("claude-3")), \
+         patch("tiktoken.get_encoding", return_value=fake_encoding) as get_encoding:
+        assert count_tokens("hello world", model="claude-3") == 2
+        assert count_tokens("again", model="claude-3") == 1
+
+    get_encoding.assert_called_once_with("cl100k_base")
+
+def test_empty_text_skips_tokenizer():
+    with patch("tiktoken.encoding_for_model") as lookup:
+        assert count_tokens("") == 0
+    lookup.assert_not_called()
+
+def test_batch_matches_single_counts(fake_encoding):
+    fake_encoding.encode_batch.side_effect = (
+        lambda texts, num_threads: [fake_encoding.encode(t) for t in texts]
+    )
+    texts = ["one two", "", "three four five"]
+
+    with patch("tiktoken.encoding_for_model", return_value=fake_encoding):
+        assert count_tokens_batch(texts) == [count_tokens(t) for t in texts]
+        assert count_tokens_batch([]) == []
+
+    fake_encoding.encode_batch.assert_called_once_with(texts, num_threads=3)
+
+def test_approximate_count_skips_tokenizer():
+    with patch("tiktoken.encoding_for_model") as lookup:
+        assert count_tokens("abcdefgh", exact=False) == 2
+        assert count_tokens("abcdefghi", exact=False) == 3
+        assert count_tokens_approx("") == 0
+    lookup.assert_not_called()
+
+
+def test_single_ascii_char_skips_tokenizer():
+    with patch("tiktoken.encoding_for_model") as lookup:
+        assert count_tokens("x") == 1
+        assert count_tokens("\n") == 1
+    lookup.assert_not_called()
+
+def test_missing_tiktoken_raises_on_exact_count():
+    with patch.dict("sys.modules", {"tiktoken": None}):
+        assert count_tokens("abcd", exact=False) == 1
+        with pytest.raises(ImportError, match="pip install tiktoken"):
+            count_tokens("abcd")
+
+def test_warmup_swallows_tokenizer_errors():
+    import scaledown
+    with patch("scaledown.types.metrics._get_encoding", side_effect=ImportError) as get_encoding:
+        scaledown._warm_tokenizer()
+    get_encoding.assert_called_once_with("gpt-4o")
+
+def test_metrics_are_slotted_and_frozen():
+    metrics = OptimizerMetrics(
+        original_tokens=10, optimized_tokens=4, chunks_retrieved=1,
+        compression_ratio=2.5, latency_ms=1.0, retrieval_mode="bm25", ast_fidelity=1.0
+    )
+
+    assert not hasattr(metrics, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        metrics.latency_ms = 2.0
+    assert dataclasses.replace(metrics, latency_ms=2.0).latency_ms == 2.0
+
+def test_compressor_metrics_unpack_and_convert():
+    metrics = CompressorMetrics(
+        original_tokens=100, compressed_tokens=40, compression_ratio=2.5,
+        latency_ms=80.0, model_used="gpt-4o", cost_saved=0.01
+    )
+
+    original, compressed, *_ = metrics
+    assert (original, compressed) == (100, 40)
+    assert metrics._asdict()["model_used"] == "gpt-4o"
+    assert metrics._replace(latency_ms=0.0).latency_ms == 0.0
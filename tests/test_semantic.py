@@ -32,7 +32,16 @@ def helper_function():
     pass
 """
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def clear_model_cache():
+    """Models are shared process-wide; each test patches its own SentenceTransformer."""
+    if SEMANTIC_DEPS_AVAILABLE:
+        from scaledown.optimizer import semantic_code
+        semantic_code._MODEL_CACHE.clear()
+    yield
+
+# Written once per session; tests must not modify it
+@pytest.fixture(scope="session")
 def temp_python_file():
     with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as f:
         f.write(TEST_CODE)
@@ -55,7 +64,7 @@ def test_semantic_search_flow(temp_python_file):
         # Setup mock model
         mock_instance = MockModel.return_value
 
-        def mock_encode(texts):
+        def mock_encode(texts, **kwargs):
             return np.array([[0.1, 0.2] for _ in texts], dtype=np.float32)
             
         mock_instance.encode.side_effect = mock_encode
@@ -72,6 +81,10 @@ def test_semantic_search_flow(temp_python_file):
         # Should contain the processed result
         assert "def process_batch" in result.content or "def load_data" in result.content
         assert result.metrics.retrieval_mode == "semantic_search"
+        # Chunks are embedded in one batched, normalized call
+        _, encode_kwargs = mock_instance.encode.call_args_list[0]
+        assert encode_kwargs["batch_size"] == 64
+        assert encode_kwargs["normalize_embeddings"] is True
 
 @pytest.mark.skipif(not SEMANTIC_DEPS_AVAILABLE, reason="Semantic deps not installed")
 def test_fallback_on_model_failure(temp_python_file):
@@ -91,6 +104,25 @@ def test_fallback_on_model_failure(temp_python_file):
         assert result.metrics.retrieval_mode == "fallback_model_load_failed"
         assert result.metrics.original_tokens > 0
 
+@pytest.mark.skipif(not SEMANTIC_DEPS_AVAILABLE, reason="Semantic deps not installed")
+def test_metrics_can_be_skipped(temp_python_file):
+    from scaledown.optimizer import semantic_code
+
+    with patch("sentence_transformers.SentenceTransformer") as MockModel, \
+         patch.object(semantic_code, "count_tokens") as count_tokens:
+        MockModel.return_value.encode.side_effect = (
+            lambda texts, **kwargs: np.array([[0.1, 0.2] for _ in texts], dtype=np.float32)
+        )
+        opt = SemanticOptimizer(top_k=1, collect_metrics=False)
+
+        result = opt.optimize(context="", file_path=temp_python_file, query="process data")
+        fallback = opt.optimize(context="some context", file_path=None)
+
+    assert result.content
+    assert result.metrics is semantic_code._NULL_METRICS
+    assert fallback.metrics is semantic_code._NULL_METRICS
+    count_tokens.assert_not_called()
+
 def test_missing_file_path():
     """Test behavior when file_path is missing."""
     if not SEMANTIC_DEPS_AVAILABLE:
@@ -101,3 +133,93 @@ def test_missing_file_path():
     
     assert result.content == "some context"
     assert result.metrics.retrieval_mode.startswith("fallback")
+
+@pytest.mark.skipif(not SEMANTIC_DEPS_AVAILABLE, reason="Semantic deps not installed")
+def test_chunk_embeddings_are_cached(temp_python_file, tmp_path):
+    """Chunks are embedded once; later calls (and new instances) reuse the cache."""
+
+    with patch("sentence_transformers.SentenceTransformer") as MockModel:
+        mock_instance = MockModel.return_value
+        mock_instance.encode.side_effect = (
+            lambda texts, **kwargs: np.array([[0.1, 0.2] for _ in texts], dtype=np.float32)
+        )
+
+        opt = SemanticOptimizer(top_k=1, cache_dir=str(tmp_path))
+        opt.optimize(context="", file_path=temp_python_file, query="process data")
+        opt.optimize(context="", file_path=temp_python_file, query="load data")
+        opt.optimize(context="", file_path=temp_python_file, query="process data")
+
+        encoded = [call.args[0] for call in mock_instance.encode.call_args_list]
+        # One batch for the chunks, then each distinct query once
+        assert encoded[1:] == [["process data"], ["load data"]]
+        assert len(list(tmp_path.glob("*.npy"))) == len(encoded[0])
+
+        fresh = SemanticOptimizer(top_k=1, cache_dir=str(tmp_path))
+        mock_instance.encode.reset_mock()
+        fresh.optimize(context="", file_path=temp_python_file, query="process data")
+        assert [call.args[0] for call in mock_instance.encode.call_args_list] == [["process data"]]
+
+@pytest.mark.skipif(not SEMANTIC_DEPS_AVAILABLE, reason="Semantic deps not installed")
+def test_unit_extraction_parses_each_source_once(tmp_path):
+    from scaledown.optimizer import semantic_code
+    semantic_code._UNIT_CACHE.clear()
+
+    first, second = str(tmp_path / "first.py"), str(tmp_path / "second.py")
+    for path in (first, second):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(TEST_CODE)
+    opt = SemanticOptimizer()
+
+    with patch.object(semantic_code.ast, "parse", wraps=semantic_code.ast.parse) as parse:
+        source, units = opt._extract_semantic_units(first)
+        _, copy_units = opt._extract_semantic_units(second)
+        assert parse.call_count == 1
+
+        with open(first, "a", encoding="utf-8") as f:
+            f.write("\ndef added_later():\n    return 1\n")
+        _, edited_units = opt._extract_semantic_units(first)
+        assert parse.call_count == 2
+
+    assert source == TEST_CODE
+    assert all(u["type"] in ("class", "function") for u in units)
+    assert [u["code"] for u in copy_units] == [u["code"] for u in units]
+    assert {u["metadata"]["file_name"] for u in copy_units} == {"second.py"}
+    assert "added_later" in [u["name"] for u in edited_units]
+
+@pytest.mark.skipif(not SEMANTIC_DEPS_AVAILABLE, reason="Semantic deps not installed")
+def test_duplicate_chunks_are_embedded_once():
+    opt = SemanticOptimizer()
+    opt._numpy = np
+    opt._model = MagicMock()
+    opt._model.encode.side_effect = (
+        lambda texts, **kwargs: np.array([[len(t) / 10, 0.5] for t in texts], dtype=np.float32)
+    )
+
+    embeddings = opt._embed_chunks(["def a(): pass", "x = 1", "def a(): pass"])
+
+    assert opt._model.encode.call_args.args[0] == ["def a(): pass", "x = 1"]
+    assert embeddings.shape == (3, 2)
+    assert (embeddings[0] == embeddings[2]).all()
+
+@pytest.mark.skipif(not SEMANTIC_DEPS_AVAILABLE, reason="Semantic deps not installed")
+def test_model_is_shared_across_instances():
+    with patch("sentence_transformers.SentenceTransformer") as MockModel:
+        first, second = SemanticOptimizer(), SemanticOptimizer()
+        first._lazy_load_deps()
+        second._lazy_load_deps()
+
+    assert MockModel.call_count == 1
+    assert first._model is second._model
+
+@pytest.mark.skipif(not SEMANTIC_DEPS_AVAILABLE, reason="Semantic deps not installed")
+def test_search_is_exact_for_large_inputs():
+    opt = SemanticOptimizer()
+    opt._numpy = np
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((2500, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    embeddings = opt._quantize(vectors)
+    query = vectors[:1]
+
+    expected = np.argsort(-(embeddings.astype(np.float32) @ query[0]), kind="stable")[:3].tolist()
+    assert opt._search(embeddings, query, 3) == expected